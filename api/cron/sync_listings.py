@@ -10,7 +10,7 @@ sys.path.append(os.getcwd())
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 try:
-    from src.fetch_listings import sync_opensea_originals, sync_tokenworks, sync_editions
+    from src.fetch_listings import run_sync_cycle
 except ImportError as e:
     print(f"ImportError: {e}")
     # This might happen if paths are tricky, but adding os.getcwd() usually fixes it on Vercel
@@ -20,19 +20,13 @@ class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
             # Re-import inside handler to ensure path is set if it wasn't before
-            from src.fetch_listings import sync_opensea_originals, sync_tokenworks, sync_editions
+            from src.fetch_listings import run_sync_cycle
             
-            ORIGINALS_TABLE = "vv_checks_listings"
             print("Starting sync_listings cron...")
             
-            # 1) OpenSea Originals -> shared table
-            sync_opensea_originals(ORIGINALS_TABLE)
-            
-            # 2) TokenWorks Originals -> same table
-            sync_tokenworks(ORIGINALS_TABLE)
-            
-            # 3) Editions stay separate
-            sync_editions("vv_editions_listings")
+            # OpenSea Originals, TokenWorks and Editions under one run
+            # timestamp, followed by the "last updated" heartbeat
+            run_sync_cycle()
             
             self.send_response(200)
             self.end_headers()
@@ -17,15 +17,27 @@ export default function Home({ blackCheckData }) {
     if (!supabase) return;
     
     try {
-      const { data, error } = await supabase
-        .from("vv_checks_listings")
-        .select("last_seen_at")
-        .order("last_seen_at", { ascending: false })
-        .limit(1)
-        .single();
+      // Heartbeat written after every successful sync cycle (watch mode
+      // only rewrites changed rows, so last_seen_at can lag behind)
+      const { data: heartbeat } = await supabase
+        .from("sync_state")
+        .select("updated_at")
+        .eq("key", "listings_sync")
+        .maybeSingle();
+
+      let lastSeen = heartbeat && heartbeat.updated_at;
+      if (!lastSeen) {
+        const { data, error } = await supabase
+          .from("vv_checks_listings")
+          .select("last_seen_at")
+          .order("last_seen_at", { ascending: false })
+          .limit(1)
+          .single();
+        lastSeen = data && data.last_seen_at;
+      }
       
-      if (data && data.last_seen_at) {
-        const date = new Date(data.last_seen_at);
+      if (lastSeen) {
+        const date = new Date(lastSeen);
         // Format: "Oct 24, 2023, 10:30 PM"
         setLastUpdated(date.toLocaleString("en-US", {
           year: "numeric",
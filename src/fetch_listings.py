@@ -1,6 +1,8 @@
 import os
+import argparse
+import threading
 from decimal import Decimal
-from typing import List, Dict, Any, Set, Optional
+from typing import List, Dict, Any, Set, Optional, Tuple
 from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -9,6 +11,28 @@ from dotenv import load_dotenv
 from supabase import create_client, Client
 from web3 import Web3
 
+from src.http_retry import get_with_retries
+from src.price_archive import PRICE_ARCHIVE_DIR, append_run
+from src.refresh_schedule import (
+    REFRESH_BUDGET,
+    next_refresh_at,
+    plan_refreshes,
+)
+from src.watch import (
+    WATCH_HEALTH_PORT,
+    WATCH_INTERVAL_SECONDS,
+    changed_rows,
+    run_syncs,
+    run_watch,
+)
+from src.tokenworks_inventory import (
+    TRANSFER_TOPIC,
+    InventoryError,
+    address_topic,
+    decode_transfer_logs,
+    resolve_holding_set,
+)
+
 load_dotenv()
 
 OPENSEA_API_KEY = os.getenv("OPENSEA_API_KEY")
@@ -20,6 +44,9 @@ ALCHEMY_RPC_URL = os.getenv("ALCHEMY_RPC_URL")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 w3 = Web3(Web3.HTTPProvider(ALCHEMY_RPC_URL))
 
+# Shared session so OpenSea/Alchemy connections are pooled and kept alive
+http_session = requests.Session()
+
 # Contracts
 CHECKS_EDITIONS_CONTRACT = os.getenv("CHECKS_EDITIONS_CONTRACT")
 CHECKS_ORIGINALS_CONTRACT = os.getenv("CHECKS_ORIGINALS_CONTRACT")
@@ -31,6 +58,23 @@ OPENSEA_BASE = "https://api.opensea.io/api/v2/listings/collection"
 # Alchemy base
 ALCHEMY_BASE_URL = f"https://eth-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
 
+# Key/value rows for sync bookkeeping: the SYNC_HEARTBEAT_KEY row is stamped
+# after every successful cycle and read by the site as "last updated".
+SYNC_STATE_TABLE = "sync_state"
+SYNC_HEARTBEAT_KEY = "listings_sync"
+
+# TokenWorks inventory: the last known holding set and the block it was
+# observed at live in INVENTORY_STATE_TABLE. Each run scans Transfer logs
+# from that block in INVENTORY_LOG_BLOCK_RANGE chunks; a full getNFTs crawl
+# is used only without state, after a failed scan, or when the gap exceeds
+# INVENTORY_MAX_SCAN_BLOCKS. The head is trailed by INVENTORY_CONFIRMATIONS.
+INVENTORY_STATE_TABLE = SYNC_STATE_TABLE
+INVENTORY_STATE_KEY = "tokenworks_inventory"
+INVENTORY_LOG_BLOCK_RANGE = int(os.getenv("INVENTORY_LOG_BLOCK_RANGE", "2000"))
+INVENTORY_MAX_SCAN_BLOCKS = int(os.getenv("INVENTORY_MAX_SCAN_BLOCKS", "200000"))
+INVENTORY_CONFIRMATIONS = int(os.getenv("INVENTORY_CONFIRMATIONS", "6"))
+INVENTORY_SCAN_WORKERS = int(os.getenv("INVENTORY_SCAN_WORKERS", "4"))
+
 # Minimal ABI for TokenWorks.nftForSale(uint256) -> uint256
 TOKENWORKS_ABI = [
     {
@@ -54,16 +98,18 @@ def wei_to_eth(wei: str | int) -> str:
 
 
 def fetch_best_offer_eth(collection_slug: str, token_id: str) -> str | None:
+    """
+    Best offer for a token in ETH, or None if it has no offer (404 or an
+    empty response). A failed lookup (rate limit, timeout, 5xx) raises, so
+    callers can keep the previous offer instead of clearing it.
+    """
     headers = {"accept": "*/*", "x-api-key": OPENSEA_API_KEY}
     url = f"https://api.opensea.io/api/v2/offers/collection/{collection_slug}/nfts/{token_id}/best"
-    try:
-        res = requests.get(url, headers=headers, timeout=15)
-        if res.status_code == 404:
-            return None
-        res.raise_for_status()
-        data = res.json()
-    except Exception:
+    res = http_session.get(url, headers=headers, timeout=15)
+    if res.status_code == 404:
         return None
+    res.raise_for_status()
+    data = res.json() or {}
 
     obj = data.get("offer") or data
     price_obj = obj.get("price") if isinstance(obj, dict) else None
@@ -89,6 +135,21 @@ def get_existing_token_ids(table_name: str, source: str | None = None) -> Set[st
     return {str(row["token_id"]) for row in rows}
 
 
+def get_existing_rows(
+    table_name: str, columns: str, source: str | None = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch current rows in a Supabase table (optionally per-source),
+    keyed by token_id.
+    """
+    query = supabase.table(table_name).select(f"token_id, {columns}")
+    if source is not None:
+        query = query.eq("source", source)
+    resp = query.execute()
+    rows = resp.data or []
+    return {str(row["token_id"]): row for row in rows}
+
+
 def batch_upsert(table_name: str, data: List[Dict[str, Any]], batch_size: int = 100) -> None:
     """
     Upsert data in batches to Supabase.
@@ -108,13 +169,16 @@ def delete_stale_tokens(
     table_name: str, 
     current_ids: Set[str], 
     source: str | None = None, 
-    batch_size: int = 100
+    batch_size: int = 100,
+    existing_ids: Set[str] | None = None,
 ) -> int:
     """
     Delete tokens from DB that are not in current_ids.
+    Pass existing_ids to skip re-reading them from Supabase.
     Returns number of deleted tokens.
     """
-    existing_ids = get_existing_token_ids(table_name, source=source)
+    if existing_ids is None:
+        existing_ids = get_existing_token_ids(table_name, source=source)
     to_delete = list(existing_ids - current_ids)
     
     if not to_delete:
@@ -133,12 +197,21 @@ def delete_stale_tokens(
 # ---------------------------------------------------------
 # OpenSea: fetch listings for a collection (by slug)
 # ---------------------------------------------------------
+class ListingsError(RuntimeError):
+    """A collection's listings could not be fetched completely."""
+
+
 def fetch_all_listings_for_collection(
     collection_slug: str,
+    retries: int = 3,
 ) -> List[Dict[str, Any]]:
     """
     Fetch all listings from OpenSea for a given collection slug.
     Returns a list of dicts with token_id, price_eth, and owner.
+
+    Rate-limited (429) and 5xx pages are retried with backoff; any page
+    that still fails raises ListingsError, so a truncated crawl can never
+    be mistaken for the full set of listings and used to delete rows.
     """
     base_url = f"{OPENSEA_BASE}/{collection_slug}/best"
 
@@ -156,14 +229,12 @@ def fetch_all_listings_for_collection(
             url += f"?next={next_cursor}"
 
         try:
-            res = requests.get(url, headers=headers, timeout=20)
-            if res.status_code == 404:
-                return []
-            res.raise_for_status()
+            res = get_with_retries(
+                http_session.get, url, retries=retries, headers=headers, timeout=20
+            )
             data = res.json()
         except Exception as e:
-            print(f"Error fetching listings for {collection_slug}: {e}")
-            break
+            raise ListingsError(f"Error fetching listings for {collection_slug}: {e}") from e
 
         for item in data.get("listings", []):
             params = item.get("protocol_data", {}).get("parameters", {})
@@ -214,43 +285,109 @@ def reduce_to_floor_per_token(
     return list(floors.values())
 
 
+def archive_floor_listings(
+    table_name: str,
+    rows: List[Dict[str, Any]],
+    run_at: datetime,
+    source: str | None,
+    existing: Dict[str, Dict[str, Any]],
+    tier_column: str | None = None,
+) -> None:
+    """
+    Append this run's floor listings to the local price-history archive
+    (no-op unless PRICE_ARCHIVE_DIR is set). Failures are logged, never raised.
+    """
+    if not PRICE_ARCHIVE_DIR:
+        return
+
+    tiers = {}
+    if tier_column:
+        tiers = {tid: row.get(tier_column) for tid, row in existing.items()}
+
+    try:
+        written = append_run(table_name, rows, run_at, source=source, tiers=tiers)
+        print(f"[{source or table_name}] Archived {written} listings")
+    except Exception as e:
+        print(f"[{source or table_name}] Error archiving listings: {e}")
+
+
 # ---------------------------------------------------------
 # Sync Logic
 # ---------------------------------------------------------
 def sync_opensea_collection(
     collection_slug: str, 
     table_name: str, 
-    source: str | None = None
-) -> None:
+    source: str | None = None,
+    tier_column: str | None = None,
+    budget: int = REFRESH_BUDGET,
+    existing: Dict[str, Dict[str, Any]] | None = None,
+    run_at: datetime | None = None,
+) -> Dict[str, Dict[str, Any]]:
     """
     Generic sync for OpenSea collections.
-    Fetches listings, reduces to floor, fetches best offers (concurrently),
-    upserts to DB, and deletes stale tokens.
+    Fetches listings, reduces to floor, refreshes best offers (concurrently)
+    for the tokens the scheduler picks, upserts to DB, and deletes stale tokens.
+
+    If `existing` (the state returned by a previous call) is given, nothing
+    is re-read from Supabase and only changed rows are written.
+    Returns the new state, keyed by token_id. Raises ListingsError, before
+    anything is written or deleted, if the listings crawl is incomplete.
+    `run_at` is the archive run timestamp (defaults to now).
     """
     listings = fetch_all_listings_for_collection(collection_slug)
     floor_listings = reduce_to_floor_per_token(listings)
-    
-    print(f"[{collection_slug}] Processing {len(floor_listings)} listings...")
-    
+
+    deltas_only = existing is not None
+    if existing is None:
+        columns = "price_eth, highest_offer_eth, owner, next_refresh_at"
+        if tier_column:
+            columns += f", {tier_column}"
+        existing = get_existing_rows(table_name, columns, source=source)
+
+    now = datetime.now(timezone.utc)
+    planned = plan_refreshes(
+        floor_listings, existing, now, budget, tier_column=tier_column
+    )
+    refresh_ids = {row["token_id"] for row, _ in planned}
+
+    print(
+        f"[{collection_slug}] Processing {len(floor_listings)} listings "
+        f"(refreshing offers for {len(planned)})..."
+    )
+
+    # Carry forward offers and schedule for tokens not refreshed this run
+    for row in floor_listings:
+        if row["token_id"] in refresh_ids:
+            continue
+        prev = existing.get(row["token_id"]) or {}
+        row["highest_offer_eth"] = prev.get("highest_offer_eth")
+        row["next_refresh_at"] = prev.get("next_refresh_at")
+
     # Concurrently fetch best offers
     offers_set = 0
     with ThreadPoolExecutor(max_workers=5) as executor:
         future_to_token = {
-            executor.submit(fetch_best_offer_eth, collection_slug, row["token_id"]): row 
-            for row in floor_listings
+            executor.submit(fetch_best_offer_eth, collection_slug, row["token_id"]): (row, hot)
+            for row, hot in planned
         }
         
         for future in as_completed(future_to_token):
-            row = future_to_token[future]
+            row, hot = future_to_token[future]
             try:
                 ho = future.result()
-                if ho is not None:
-                    row["highest_offer_eth"] = ho
-                    offers_set += 1
             except Exception as exc:
+                # Keep the known offer and schedule so the row stays due
                 print(f"[{collection_slug}] Error fetching offer for token {row['token_id']}: {exc}")
+                prev = existing.get(row["token_id"]) or {}
+                row["highest_offer_eth"] = prev.get("highest_offer_eth")
+                row["next_refresh_at"] = prev.get("next_refresh_at")
+                continue
+            row["highest_offer_eth"] = ho
+            row["next_refresh_at"] = next_refresh_at(now, hot)
+            if ho is not None:
+                offers_set += 1
 
-    now_ts = datetime.now(timezone.utc).isoformat()
+    now_ts = now.isoformat()
 
     # Prepare batch
     for row in floor_listings:
@@ -259,28 +396,66 @@ def sync_opensea_collection(
             row["source"] = source
 
     # Upsert
-    batch_upsert(table_name, floor_listings)
+    to_write = changed_rows(floor_listings, existing) if deltas_only else floor_listings
+    batch_upsert(table_name, to_write)
     print(f"[{collection_slug}] Highest offers set: {offers_set}")
+    if deltas_only:
+        print(f"[{collection_slug}] Changed rows written: {len(to_write)}")
+
+    archive_floor_listings(
+        table_name, floor_listings, run_at or now, source, existing, tier_column
+    )
 
     # Delete stale
     current_ids = {l["token_id"] for l in floor_listings}
-    deleted_count = delete_stale_tokens(table_name, current_ids, source=source)
+    deleted_count = delete_stale_tokens(
+        table_name, current_ids, source=source, existing_ids=set(existing)
+    )
     
     if deleted_count > 0:
         print(f"[{collection_slug}] Deleted stale tokens: {deleted_count}")
     else:
         print(f"[{collection_slug}] No stale tokens to delete")
 
+    return {
+        row["token_id"]: {**existing.get(row["token_id"], {}), **row}
+        for row in floor_listings
+    }
+
 
-def sync_tokenworks(table_name: str) -> None:
+def sync_tokenworks(
+    table_name: str,
+    existing: Dict[str, Dict[str, Any]] | None = None,
+    run_at: datetime | None = None,
+) -> Dict[str, Dict[str, Any]]:
     """
     Sync TokenWorks listings into vv_checks_listings with source='tokenworks'.
+    Like sync_opensea_collection, an `existing` state skips the Supabase
+    re-read and limits writes to changed rows; the new state is returned.
     """
-    listings = fetch_tokenworks_listings(table_name)
+    deltas_only = existing is not None
+    if existing is None:
+        try:
+            existing = get_existing_rows(
+                table_name, "price_eth, highest_offer_eth, owner, next_refresh_at, checks",
+                source="tokenworks",
+            )
+        except Exception as e:
+            print(f"[tokenworks] Error fetching existing rows: {e}")
+            existing = {}
+
+    try:
+        listings = fetch_tokenworks_listings(existing)
+    except InventoryError as e:
+        # Without a holding set we cannot tell stale rows apart; change nothing
+        print(f"[tokenworks] Skipping sync, inventory unavailable: {e}")
+        return existing
+
     
     print(f"[tokenworks] Processing {len(listings)} listings (skipping offers)...")
     
-    now_ts = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
+    now_ts = now.isoformat()
     
     # Prepare batch
     for row in listings:
@@ -289,22 +464,145 @@ def sync_tokenworks(table_name: str) -> None:
         row["source"] = "tokenworks"
 
     # Upsert
-    batch_upsert(table_name, listings)
-    print(f"[tokenworks] Upserted listings: {len(listings)}")
+    to_write = changed_rows(listings, existing) if deltas_only else listings
+    batch_upsert(table_name, to_write)
+    print(f"[tokenworks] Upserted listings: {len(to_write)}")
+
+    archive_floor_listings(
+        table_name, listings, run_at or now, "tokenworks", existing, "checks"
+    )
 
     # Delete stale
     current_ids = {l["token_id"] for l in listings}
-    deleted_count = delete_stale_tokens(table_name, current_ids, source="tokenworks")
+    deleted_count = delete_stale_tokens(
+        table_name, current_ids, source="tokenworks", existing_ids=set(existing)
+    )
     
     if deleted_count > 0:
         print(f"[tokenworks] Deleted stale tokens: {deleted_count}")
     else:
         print(f"[tokenworks] No stale tokens to delete")
 
+    return {
+        row["token_id"]: {**existing.get(row["token_id"], {}), **row}
+        for row in listings
+    }
 
-def fetch_tokenworks_check_token_ids() -> List[str]:
+
+# ---------------------------------------------------------
+# TokenWorks inventory
+# ---------------------------------------------------------
+# In-process copy of the persisted inventory (reused across watch cycles)
+_inventory_cache: Dict[str, Any] = {}
+
+
+def load_inventory_state() -> Dict[str, Any] | None:
+    """
+    Last known TokenWorks holding set: {"block_number": int, "token_ids": [...]}.
+    Returns None if nothing has been stored yet.
+    """
+    if "block_number" in _inventory_cache:
+        return {k: _inventory_cache[k] for k in ("block_number", "token_ids")}
+
+    resp = (
+        supabase.table(INVENTORY_STATE_TABLE)
+        .select("block_number, token_ids")
+        .eq("key", INVENTORY_STATE_KEY)
+        .execute()
+    )
+    rows = resp.data or []
+    if not rows or rows[0].get("block_number") is None:
+        return None
+
+    state = {
+        "block_number": int(rows[0]["block_number"]),
+        "token_ids": [str(t) for t in rows[0].get("token_ids") or []],
+    }
+    _inventory_cache.update(state)
+    return dict(state)
+
+
+def save_inventory_state(block_number: int, token_ids: Set[str]) -> None:
+    """Persist the holding set observed at block_number."""
+    state = {
+        "block_number": block_number,
+        "token_ids": sorted(token_ids, key=int),
+    }
+    supabase.table(INVENTORY_STATE_TABLE).upsert(
+        {
+            "key": INVENTORY_STATE_KEY,
+            **state,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        },
+        on_conflict="key",
+    ).execute()
+    _inventory_cache.update(state)
+
+
+def load_unlisted_tokens() -> Dict[str, str]:
+    """
+    TokenWorks tokens last seen not for sale, mapped to when they are next
+    re-checked. Stored on the inventory row alongside the holding set.
+    """
+    if "unlisted" not in _inventory_cache:
+        resp = (
+            supabase.table(INVENTORY_STATE_TABLE)
+            .select("unlisted")
+            .eq("key", INVENTORY_STATE_KEY)
+            .execute()
+        )
+        rows = resp.data or []
+        _inventory_cache["unlisted"] = {
+            str(t): at for t, at in ((rows[0].get("unlisted") if rows else None) or {}).items()
+        }
+    return dict(_inventory_cache["unlisted"])
+
+
+def save_unlisted_tokens(unlisted: Dict[str, str]) -> None:
+    """Persist the not-for-sale tokens and their next check times."""
+    supabase.table(INVENTORY_STATE_TABLE).upsert(
+        {"key": INVENTORY_STATE_KEY, "unlisted": unlisted},
+        on_conflict="key",
+    ).execute()
+    _inventory_cache["unlisted"] = dict(unlisted)
+
+
+def fetch_tokenworks_transfers(from_block: int, to_block: int) -> List[Dict[str, Any]]:
+    """
+    Checks Originals Transfer logs into or out of TokenWorks between
+    from_block and to_block (inclusive), via batched eth_getLogs over
+    INVENTORY_LOG_BLOCK_RANGE chunks fetched concurrently.
+    Returns [{"block", "log_index", "token_id", "incoming"}] in chain order.
+    Raises on any failed range so a partial scan is never used.
+    """
+    contract = Web3.to_checksum_address(CHECKS_ORIGINALS_CONTRACT)
+    tw_topic = address_topic(TOKENWORKS_ADDRESS)
+
+    ranges: List[Tuple[int, int, List[Any]]] = []
+    for start in range(from_block, to_block + 1, INVENTORY_LOG_BLOCK_RANGE):
+        end = min(start + INVENTORY_LOG_BLOCK_RANGE - 1, to_block)
+        ranges.append((start, end, [TRANSFER_TOPIC, tw_topic]))        # outgoing
+        ranges.append((start, end, [TRANSFER_TOPIC, None, tw_topic]))  # incoming
+
+    def get_logs(start: int, end: int, topics: List[Any]) -> List[Any]:
+        return w3.eth.get_logs(
+            {"fromBlock": start, "toBlock": end, "address": contract, "topics": topics}
+        )
+
+    logs: List[Any] = []
+    with ThreadPoolExecutor(max_workers=INVENTORY_SCAN_WORKERS) as executor:
+        futures = [executor.submit(get_logs, *req) for req in ranges]
+        for future in as_completed(futures):
+            logs.extend(future.result())
+
+    return decode_transfer_logs(logs, TOKENWORKS_ADDRESS)
+
+
+def crawl_tokenworks_token_ids() -> List[str]:
     """
     Use Alchemy getNFTs to fetch all Checks Originals owned by TokenWorks.
+    Raises InventoryError if any page fails, rather than returning a
+    partial inventory.
     """
     token_ids: List[str] = []
     page_key = None
@@ -320,12 +618,11 @@ def fetch_tokenworks_check_token_ids() -> List[str]:
 
         url = f"{ALCHEMY_BASE_URL}/getNFTs"
         try:
-            resp = requests.get(url, params=params, timeout=20)
+            resp = http_session.get(url, params=params, timeout=20)
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
-             print(f"[tokenworks] Error fetching NFTs: {e}")
-             break
+            raise InventoryError(f"getNFTs crawl failed: {e}") from e
 
         for nft in data.get("ownedNfts", []):
             raw_id = nft["id"]["tokenId"]  # hex string like "0x1234"
@@ -339,54 +636,99 @@ def fetch_tokenworks_check_token_ids() -> List[str]:
     return token_ids
 
 
-def fetch_tokenworks_listings(table_name: str) -> List[Dict[str, Any]]:
+def fetch_tokenworks_check_token_ids() -> List[str]:
     """
-    Fetch TokenWorks listings, using cached prices if available.
+    Current TokenWorks holding set of Checks Originals: the stored set
+    brought up to date by Transfer logs, or a full crawl when needed (see
+    resolve_holding_set). Raises InventoryError if it cannot be determined.
     """
-    token_ids = fetch_tokenworks_check_token_ids()
-    listings: List[Dict[str, Any]] = []
+    try:
+        state = load_inventory_state()
+    except Exception as e:
+        print(f"[tokenworks] Error loading inventory state: {e}")
+        state = None
 
-    # 1) Fetch existing cached prices to minimize RPC calls
     try:
-        resp = (
-            supabase.table(table_name)
-            .select("token_id, price_eth")
-            .eq("source", "tokenworks")
-            .execute()
-        )
-        db_rows = resp.data or []
-        db_map = {str(row["token_id"]): row["price_eth"] for row in db_rows}
+        head = w3.eth.block_number - INVENTORY_CONFIRMATIONS
     except Exception as e:
-        print(f"[tokenworks] Error fetching existing rows: {e}")
-        db_map = {}
+        print(f"[tokenworks] Error reading block number: {e}")
+        head = None
+
+    token_ids, block = resolve_holding_set(
+        state,
+        head,
+        fetch_tokenworks_transfers,
+        crawl_tokenworks_token_ids,
+        INVENTORY_MAX_SCAN_BLOCKS,
+    )
+
+    if block is not None:
+        try:
+            save_inventory_state(block, set(token_ids))
+        except Exception as e:
+            print(f"[tokenworks] Error saving inventory state: {e}")
+
+    return token_ids
+
+
+def fetch_tokenworks_listings(
+    existing: Dict[str, Dict[str, Any]],
+    budget: int = REFRESH_BUDGET,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch TokenWorks listings, using the cached prices in `existing`
+    (the stored tokenworks rows, keyed by token_id) until a token is due
+    for a refresh. Listed inventory is refreshed on the hot interval and
+    tokens that are not for sale on the cold one; newly held tokens are
+    priced first, and at most `budget` nftForSale calls are made per run.
+    """
+    token_ids = fetch_tokenworks_check_token_ids()
+    unlisted = load_unlisted_tokens()
+    listings: List[Dict[str, Any]] = []
 
-    print(f"[tokenworks] Found {len(token_ids)} owned tokens. Checking prices...")
+    # 1) Decide which tokens get an on-chain lookup this run
+    now = datetime.now(timezone.utc)
+    lookup_ids = plan_inventory_lookups(token_ids, existing, unlisted, now, budget)
+    lookup_set = set(lookup_ids)
+
+    print(
+        f"[tokenworks] Found {len(token_ids)} owned tokens "
+        f"({len(unlisted)} known not for sale). "
+        f"Checking {len(lookup_ids)} prices on-chain..."
+    )
+
+    def cached_row(token_id: str) -> Dict[str, Any]:
+        return {
+            "token_id": token_id,
+            "price_eth": existing[token_id]["price_eth"],
+            "owner": TOKENWORKS_ADDRESS,
+            "next_refresh_at": existing[token_id].get("next_refresh_at"),
+        }
+
+    def is_listed(token_id: str) -> bool:
+        return (existing.get(token_id) or {}).get("price_eth") is not None
 
     for token_id in token_ids:
-        # Check cache first
-        cached_price = db_map.get(token_id)
-        
-        if cached_price is not None:
-            listings.append(
-                {
-                    "token_id": token_id,
-                    "price_eth": cached_price,
-                    "owner": TOKENWORKS_ADDRESS,
-                }
-            )
-            continue
+        if token_id not in lookup_set and is_listed(token_id):
+            listings.append(cached_row(token_id))
 
-        # Otherwise, check on-chain
+    # 2) Check on-chain for the scheduled tokens
+    for token_id in lookup_ids:
         tid_int = int(token_id)
         try:
             price_wei = tokenworks_contract.functions.nftForSale(tid_int).call()
         except Exception:
+            # Keep the cached price (if any) and retry next run
+            if is_listed(token_id):
+                listings.append(cached_row(token_id))
             continue
 
-        # 0 = not for sale
+        # 0 = not for sale: remember it so it is re-checked on the cold interval
         if price_wei is None or int(price_wei) == 0:
+            unlisted[token_id] = next_refresh_at(now, False)
             continue
 
+        unlisted.pop(token_id, None)
         price_eth = wei_to_eth(price_wei)
 
         listings.append(
@@ -394,9 +736,16 @@ def fetch_tokenworks_listings(table_name: str) -> List[Dict[str, Any]]:
                 "token_id": token_id,
                 "price_eth": price_eth,
                 "owner": TOKENWORKS_ADDRESS,
+                "next_refresh_at": next_refresh_at(now, True),
             }
         )
 
+    # Forget tokens TokenWorks no longer holds
+    held = set(token_ids)
+    unlisted = {t: at for t, at in unlisted.items() if t in held}
+    if unlisted != _inventory_cache.get("unlisted"):
+        save_unlisted_tokens(unlisted)
+
     return listings
 
 
@@ -405,22 +754,104 @@ def fetch_tokenworks_listings(table_name: str) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------
 # Expose the old function names for backward compatibility if needed, 
 # or just wrap the new generic one.
-def sync_opensea_originals(table_name: str) -> None:
-    sync_opensea_collection("vv-checks-originals", table_name, source="opensea")
+def sync_opensea_originals(
+    table_name: str,
+    existing: Dict[str, Dict[str, Any]] | None = None,
+    run_at: datetime | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    return sync_opensea_collection(
+        "vv-checks-originals", table_name, source="opensea", tier_column="checks",
+        existing=existing, run_at=run_at,
+    )
+
+def sync_editions(
+    table_name: str,
+    existing: Dict[str, Dict[str, Any]] | None = None,
+    run_at: datetime | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    return sync_opensea_collection(
+        "vv-checks", table_name, source=None, existing=existing, run_at=run_at
+    )
+
+
+ORIGINALS_TABLE = "vv_checks_listings"
+EDITIONS_TABLE = "vv_editions_listings"
+
+
+def run_sync_cycle(
+    states: Dict[str, Dict[str, Dict[str, Any]]] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Run every sync once. With a `states` dict (watch mode), each sync
+    starts from its cached state and the dict is updated in place;
+    missing entries are loaded from Supabase.
+
+    An incomplete listings crawl (ListingsError) skips only that
+    collection's upsert and delete; the other syncs still run, and
+    PartialCycleError is raised at the end instead of recording the
+    heartbeat. Once `stop` is set (watch-mode shutdown) no further syncs
+    start and no heartbeat is recorded.
+
+    All syncs in a cycle archive under one run timestamp, so OpenSea and
+    TokenWorks rows of vv_checks_listings form a single run.
+    """
+    if states is None:
+        states = {}
+    run_at = datetime.now(timezone.utc)
+
+    completed = run_syncs(
+        [
+            # 1) OpenSea Originals -> shared table
+            ("opensea", lambda existing: sync_opensea_originals(ORIGINALS_TABLE, existing, run_at)),
+            # 2) TokenWorks Originals -> same table
+            ("tokenworks", lambda existing: sync_tokenworks(ORIGINALS_TABLE, existing, run_at)),
+            # 3) Editions stay separate
+            ("editions", lambda existing: sync_editions(EDITIONS_TABLE, existing, run_at)),
+        ],
+        states,
+        skip_errors=(ListingsError,),
+        stop=stop,
+    )
+
+    if completed:
+        record_sync_heartbeat(run_at)
+
+
+def record_sync_heartbeat(run_at: datetime) -> None:
+    """
+    Stamp the `listings_sync` row of sync_state after a successful cycle.
+    Watch mode only rewrites changed rows, so max(last_seen_at) no longer
+    moves every cycle; the site reads this row for "last updated" instead.
+    """
+    try:
+        supabase.table(SYNC_STATE_TABLE).upsert(
+            {"key": SYNC_HEARTBEAT_KEY, "updated_at": run_at.isoformat()},
+            on_conflict="key",
+        ).execute()
+    except Exception as e:
+        print(f"Error recording sync heartbeat: {e}")
 
-def sync_editions(table_name: str) -> None:
-    sync_opensea_collection("vv-checks", table_name, source=None)
 
 if __name__ == "__main__":
-    ORIGINALS_TABLE = "vv_checks_listings"
-
-    # 1) OpenSea Originals -> shared table
-    sync_opensea_originals(ORIGINALS_TABLE)
-
-    # 2) TokenWorks Originals -> same table
-    sync_tokenworks(ORIGINALS_TABLE)
-
-    # 3) Editions stay separate
-    sync_editions("vv_editions_listings")
-
-    print("\nAll syncs completed ✅")
+    parser = argparse.ArgumentParser(description="Sync Checks listings into Supabase.")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Run continuously instead of a one-shot sync.",
+    )
+    parser.add_argument(
+        "--interval", type=int, default=WATCH_INTERVAL_SECONDS,
+        help="Seconds between sync cycles in watch mode.",
+    )
+    parser.add_argument(
+        "--health-port", type=int, default=WATCH_HEALTH_PORT,
+        help="Port for the watch-mode health endpoint (0 to disable).",
+    )
+    args = parser.parse_args()
+
+    if args.watch:
+        run_watch(run_sync_cycle, interval=args.interval, health_port=args.health_port or None)
+        http_session.close()
+    else:
+        run_sync_cycle()
+        print("\nAll syncs completed ✅")
@@ -0,0 +1,32 @@
+import time
+from typing import Any, Callable
+
+import requests
+
+
+def get_with_retries(
+    get: Callable[..., requests.Response],
+    url: str,
+    retries: int = 3,
+    sleep: Callable[[float], None] = time.sleep,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    GET `url` with `get` (e.g. a Session's get), retrying rate-limited (429),
+    5xx and connection failures with exponential backoff, honouring a
+    numeric Retry-After. Other HTTP errors, and the last failure once
+    retries run out, are raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            res = get(url, **kwargs)
+            res.raise_for_status()
+            return res
+        except requests.RequestException as e:
+            response = e.response
+            status = response.status_code if response is not None else None
+            retryable = status is None or status == 429 or status >= 500
+            if not retryable or attempt == retries:
+                raise
+            delay = response.headers.get("Retry-After", "") if response is not None else ""
+            sleep(int(delay) if delay.isdigit() else 2 ** attempt)
@@ -0,0 +1,245 @@
+import os
+import json
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Root directory for the archive. Unset = archiving disabled (e.g. on Vercel,
+# where the filesystem does not persist between invocations).
+PRICE_ARCHIVE_DIR = os.getenv("PRICE_ARCHIVE_DIR")
+
+# A segment is closed once it holds this many rows; an append is never split.
+SEGMENT_MAX_ROWS = int(os.getenv("PRICE_ARCHIVE_SEGMENT_ROWS", "1000000"))
+
+# Fixed-width columns. Prices are stored in gwei: wei does not fit in 64 bits
+# above ~18.4 ETH, and sub-gwei precision is meaningless for listings.
+# offer_gwei == 0 means no offer; tier == 0 means unknown.
+COLUMNS: Dict[str, np.dtype] = {
+    "run_ts": np.dtype("<i8"),
+    "token_id": np.dtype("<u8"),
+    "price_gwei": np.dtype("<u8"),
+    "offer_gwei": np.dtype("<u8"),
+    "source": np.dtype("u1"),
+    "tier": np.dtype("u1"),
+}
+
+SOURCES = {None: 0, "opensea": 1, "tokenworks": 2}
+
+INDEX_FILE = "index.json"
+
+
+def eth_to_gwei(eth: str | int | float | None) -> int:
+    """Convert an ETH amount -> integer gwei (0 for None)."""
+    if eth is None:
+        return 0
+    return int(Decimal(str(eth)) * Decimal(10**9))
+
+
+# --------------------------------------------
+# Index
+# --------------------------------------------
+def _archive_path(name: str, root: str | None) -> str:
+    root = root or PRICE_ARCHIVE_DIR
+    if not root:
+        raise ValueError("PRICE_ARCHIVE_DIR is not set")
+    return os.path.join(root, name)
+
+
+def load_index(path: str) -> Dict[str, Any]:
+    """
+    Read an archive index. Each segment entry records its committed row
+    count and run_ts range; bytes past `rows` (a torn append) are ignored.
+    """
+    try:
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"segments": []}
+
+
+def _write_index(path: str, index: Dict[str, Any]) -> None:
+    tmp = os.path.join(path, INDEX_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, INDEX_FILE))
+
+
+# --------------------------------------------
+# Append
+# --------------------------------------------
+def append_run(
+    name: str,
+    rows: List[Dict[str, Any]],
+    run_at: datetime,
+    source: str | None = None,
+    tiers: Optional[Dict[str, Any]] = None,
+    root: str | None = None,
+) -> int:
+    """
+    Append floor listings (token_id, price_eth, highest_offer_eth) from
+    one source to archive `name` under run timestamp `run_at`. A "run" is
+    one sync cycle: every source synced into the same table during a cycle
+    is appended with the same `run_at`, and queries group on it.
+    `tiers` maps token_id -> checks tier where known. Appends must come in
+    non-decreasing `run_at` order; assumes a single writer per archive.
+    Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+
+    path = _archive_path(name, root)
+    os.makedirs(path, exist_ok=True)
+    index = load_index(path)
+    segments = index["segments"]
+
+    n = len(rows)
+    tiers = tiers or {}
+    run_ts = int(run_at.timestamp())
+    columns = {
+        "run_ts": np.full(n, run_ts, dtype=COLUMNS["run_ts"]),
+        "token_id": np.array([int(r["token_id"]) for r in rows], dtype=COLUMNS["token_id"]),
+        "price_gwei": np.array([eth_to_gwei(r["price_eth"]) for r in rows], dtype=COLUMNS["price_gwei"]),
+        "offer_gwei": np.array([eth_to_gwei(r.get("highest_offer_eth")) for r in rows], dtype=COLUMNS["offer_gwei"]),
+        "source": np.full(n, SOURCES.get(source, 0), dtype=COLUMNS["source"]),
+        "tier": np.array([int(tiers.get(r["token_id"]) or 0) for r in rows], dtype=COLUMNS["tier"]),
+    }
+
+    if not segments or segments[-1]["rows"] >= SEGMENT_MAX_ROWS:
+        segments.append({"name": f"{len(segments):06d}", "rows": 0, "ts_min": run_ts, "ts_max": run_ts})
+    seg = segments[-1]
+    seg_path = os.path.join(path, seg["name"])
+    os.makedirs(seg_path, exist_ok=True)
+
+    for col, dtype in COLUMNS.items():
+        col_file = os.path.join(seg_path, f"{col}.bin")
+        with open(col_file, "ab") as f:
+            # Drop any torn bytes from a crashed append before writing
+            f.truncate(seg["rows"] * dtype.itemsize)
+            f.write(columns[col].tobytes())
+
+    seg["rows"] += n
+    seg["ts_min"] = min(seg["ts_min"], run_ts)
+    seg["ts_max"] = max(seg["ts_max"], run_ts)
+    _write_index(path, index)
+
+    return n
+
+
+# --------------------------------------------
+# Query
+# --------------------------------------------
+def scan(
+    name: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    root: str | None = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield memory-mapped column views, one dict per segment, restricted to
+    start <= run_ts < end. Segments outside the range are never opened and
+    rows are sliced by binary search on run_ts, so nothing is copied.
+    """
+    path = _archive_path(name, root)
+    lo = int(start.timestamp()) if start else None
+    hi = int(end.timestamp()) if end else None
+
+    for seg in load_index(path)["segments"]:
+        if seg["rows"] == 0:
+            continue
+        if lo is not None and seg["ts_max"] < lo:
+            continue
+        if hi is not None and seg["ts_min"] >= hi:
+            continue
+
+        seg_path = os.path.join(path, seg["name"])
+        cols = {
+            col: np.memmap(os.path.join(seg_path, f"{col}.bin"), dtype=dtype, mode="r", shape=(seg["rows"],))
+            for col, dtype in COLUMNS.items()
+        }
+
+        ts = cols["run_ts"]
+        i = int(np.searchsorted(ts, lo, side="left")) if lo is not None else 0
+        j = int(np.searchsorted(ts, hi, side="left")) if hi is not None else len(ts)
+        if i >= j:
+            continue
+
+        yield {col: arr[i:j] for col, arr in cols.items()}
+
+
+def token_price_path(
+    name: str,
+    token_id: str | int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    root: str | None = None,
+) -> Dict[str, np.ndarray]:
+    """
+    A single token's history: run_ts, price_gwei, offer_gwei and source
+    for every run it was listed in, in time order.
+    """
+    tid = int(token_id)
+    parts: Dict[str, List[np.ndarray]] = {"run_ts": [], "price_gwei": [], "offer_gwei": [], "source": []}
+
+    for cols in scan(name, start, end, root):
+        mask = cols["token_id"] == tid
+        for col in parts:
+            parts[col].append(cols[col][mask])
+
+    return {
+        col: np.concatenate(chunks) if chunks else np.empty(0, dtype=COLUMNS[col])
+        for col, chunks in parts.items()
+    }
+
+
+def _min_per_group(
+    tier: np.ndarray, ts: np.ndarray, price: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Min price per (tier, run_ts) group, sorted by tier then run_ts."""
+    order = np.lexsort((ts, tier))
+    tier, ts, price = tier[order], ts[order], price[order]
+    starts = np.flatnonzero(np.r_[True, (tier[1:] != tier[:-1]) | (ts[1:] != ts[:-1])])
+    return tier[starts], ts[starts], np.minimum.reduceat(price, starts)
+
+
+def floor_per_tier(
+    name: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    source: str | None = None,
+    root: str | None = None,
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Floor price per tier per run: {tier: (run_ts, floor_gwei)}. Without
+    `source` the floor covers every source appended in that run (the
+    combined OpenSea + TokenWorks floor); pass "opensea" / "tokenworks"
+    to restrict it to one.
+    """
+    chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+    for cols in scan(name, start, end, root):
+        tier, ts, price = cols["tier"], cols["run_ts"], cols["price_gwei"]
+        if source is not None:
+            mask = cols["source"] == SOURCES[source]
+            tier, ts, price = tier[mask], ts[mask], price[mask]
+        if len(ts):
+            chunks.append(_min_per_group(tier, ts, price))
+
+    if not chunks:
+        return {}
+
+    # Re-reduce in case the same run_ts shows up in more than one segment
+    tiers, ts, floors = _min_per_group(*(np.concatenate(c) for c in zip(*chunks)))
+
+    result: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    bounds = np.flatnonzero(np.r_[True, tiers[1:] != tiers[:-1], True])
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        result[int(tiers[a])] = (ts[a:b], floors[a:b])
+
+    return result
@@ -0,0 +1,155 @@
+import os
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+from datetime import datetime, timezone, timedelta
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Refresh scheduling: listings priced within REFRESH_FLOOR_BAND of their tier
+# floor (and all TokenWorks inventory) are re-checked every REFRESH_HOT_MINUTES,
+# everything else every REFRESH_COLD_HOURS. REFRESH_BUDGET caps the number of
+# per-token lookups (offers / nftForSale calls) made by a single sync.
+# Defaults match the hourly sync_listings cron in vercel.json: hot rows every
+# run, the long tail daily as before. Watch mode can lower REFRESH_HOT_MINUTES.
+REFRESH_FLOOR_BAND = Decimal(os.getenv("REFRESH_FLOOR_BAND", "0.25"))
+REFRESH_HOT_INTERVAL = timedelta(minutes=int(os.getenv("REFRESH_HOT_MINUTES", "60")))
+REFRESH_COLD_INTERVAL = timedelta(hours=int(os.getenv("REFRESH_COLD_HOURS", "24")))
+REFRESH_BUDGET = int(os.getenv("REFRESH_BUDGET", "250"))
+
+
+# --------------------------------------------
+# Refresh scheduling
+# --------------------------------------------
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a Supabase timestamptz string (None if missing/invalid)."""
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def same_price(a: Any, b: Any) -> bool:
+    """
+    Whether two ETH amounts are equal to the gwei. Supabase returns numeric
+    columns as floats, which cannot round-trip 18-decimal wei prices.
+    """
+    gwei = Decimal("1e-9")
+    return Decimal(str(a)).quantize(gwei) == Decimal(str(b)).quantize(gwei)
+
+
+def compute_tier_floors(
+    listings: List[Dict[str, Any]],
+    existing: Dict[str, Dict[str, Any]],
+    tier_column: str | None = None,
+) -> Dict[Any, Decimal]:
+    """
+    Lowest price_eth per tier. The tier is read from the stored row's
+    tier_column (e.g. `checks`); without one the whole collection is a
+    single tier. Tokens with an unknown tier are grouped under None.
+    """
+    floors: Dict[Any, Decimal] = {}
+
+    for l in listings:
+        tier = (existing.get(l["token_id"]) or {}).get(tier_column) if tier_column else None
+        price = Decimal(l["price_eth"])
+        if tier not in floors or price < floors[tier]:
+            floors[tier] = price
+
+    return floors
+
+
+def plan_refreshes(
+    listings: List[Dict[str, Any]],
+    existing: Dict[str, Dict[str, Any]],
+    now: datetime,
+    budget: int,
+    tier_column: str | None = None,
+    always_hot: bool = False,
+) -> List[Tuple[Dict[str, Any], bool]]:
+    """
+    Pick which listings get a per-token lookup this run.
+
+    A listing is due when it is new, its price changed since the last run,
+    or its stored `next_refresh_at` has passed. New and repriced listings
+    come first regardless of their schedule, then overdue ones; within each
+    group near-floor ("hot") listings precede the rest, most overdue first.
+    The first `budget` are returned as (row, hot) pairs.
+    """
+    floors = compute_tier_floors(listings, existing, tier_column)
+    due: List[Tuple[Tuple[Any, ...], Dict[str, Any], bool]] = []
+
+    for l in listings:
+        prev = existing.get(l["token_id"])
+        price = Decimal(l["price_eth"])
+
+        if always_hot:
+            hot = True
+        else:
+            tier = (prev or {}).get(tier_column) if tier_column else None
+            hot = price <= floors[tier] * (1 + REFRESH_FLOOR_BAND)
+
+        if prev is None:
+            due.append(((0, 0 if hot else 1, now, price), l, hot))
+            continue
+
+        next_at = parse_timestamp(prev.get("next_refresh_at"))
+        prev_price = prev.get("price_eth")
+        repriced = prev_price is not None and not same_price(prev_price, price)
+
+        if repriced:
+            due.append(((0, 0 if hot else 1, next_at or now, price), l, hot))
+        elif next_at is None or next_at <= now:
+            due.append(((1, 0 if hot else 1, next_at or now, price), l, hot))
+
+    due.sort(key=lambda item: item[0])
+    return [(l, hot) for _, l, hot in due[:max(budget, 0)]]
+
+
+def plan_inventory_lookups(
+    token_ids: List[str],
+    existing: Dict[str, Dict[str, Any]],
+    unlisted: Dict[str, str],
+    now: datetime,
+    budget: int,
+) -> List[str]:
+    """
+    Pick which held tokens get an on-chain price lookup this run.
+
+    Tokens seen for the first time (no stored listing and not in
+    `unlisted`) come first. Listed tokens (stored rows with a price) and
+    known not-for-sale tokens (`unlisted`: token_id -> next check time) then
+    share the remaining budget through plan_refreshes, so unlisted tokens
+    are re-checked on their own schedule rather than ahead of everything.
+    """
+    listed = {t for t in token_ids if (existing.get(t) or {}).get("price_eth") is not None}
+    new_ids = [t for t in token_ids if t not in listed and t not in unlisted]
+
+    candidates: List[Dict[str, Any]] = []
+    schedule: Dict[str, Dict[str, Any]] = {}
+    for t in token_ids:
+        if t in listed:
+            candidates.append({"token_id": t, "price_eth": str(existing[t]["price_eth"])})
+            schedule[t] = existing[t]
+        elif t in unlisted:
+            # No price to compare; "0" never counts as repriced
+            candidates.append({"token_id": t, "price_eth": "0"})
+            schedule[t] = {"price_eth": "0", "next_refresh_at": unlisted[t]}
+
+    lookup_ids = new_ids[:max(budget, 0)]
+    planned = plan_refreshes(
+        candidates, schedule, now, budget - len(lookup_ids), always_hot=True
+    )
+    return lookup_ids + [row["token_id"] for row, _ in planned]
+
+
+def next_refresh_at(now: datetime, hot: bool) -> str:
+    """ISO timestamp of a listing's next scheduled refresh."""
+    interval = REFRESH_HOT_INTERVAL if hot else REFRESH_COLD_INTERVAL
+    return (now + interval).isoformat()
@@ -0,0 +1,115 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+class InventoryError(RuntimeError):
+    """The TokenWorks holding set could not be determined."""
+
+
+def address_topic(address: str) -> str:
+    """An address left-padded to a 32-byte log topic."""
+    return "0x" + address.lower().removeprefix("0x").rjust(64, "0")
+
+
+# --------------------------------------------
+# Transfer logs -> holding set
+# --------------------------------------------
+def decode_transfer_logs(
+    logs: Iterable[Mapping[str, Any]], holder: str
+) -> List[Dict[str, Any]]:
+    """
+    Turn ERC-721 Transfer logs into or out of `holder` into
+    [{"block", "log_index", "token_id", "incoming"}] in chain order.
+    A self-transfer matches both the "from" and "to" filters; each log is
+    kept once.
+    """
+    holder_hex = holder.lower().removeprefix("0x")
+    unique: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    for log in logs:
+        topics = log["topics"]
+        if len(topics) < 4:
+            continue
+        key = (int(log["blockNumber"]), int(log["logIndex"]))
+        unique[key] = {
+            "block": key[0],
+            "log_index": key[1],
+            "token_id": str(int.from_bytes(bytes(topics[3]), "big")),
+            "incoming": bytes(topics[2])[-20:].hex() == holder_hex,
+        }
+
+    return [unique[k] for k in sorted(unique)]
+
+
+def apply_transfers(
+    token_ids: Iterable[str], transfers: Iterable[Dict[str, Any]]
+) -> List[str]:
+    """Replay transfers (in chain order) onto a holding set."""
+    held = set(token_ids)
+
+    for t in transfers:
+        if t["incoming"]:
+            held.add(t["token_id"])
+        else:
+            held.discard(t["token_id"])
+
+    return sorted(held, key=int)
+
+
+# --------------------------------------------
+# Refresh strategy
+# --------------------------------------------
+def resolve_holding_set(
+    state: Optional[Dict[str, Any]],
+    head: Optional[int],
+    scan_transfers: Callable[[int, int], List[Dict[str, Any]]],
+    crawl: Callable[[], List[str]],
+    max_scan_blocks: int,
+) -> Tuple[List[str], Optional[int]]:
+    """
+    Bring the stored holding set ({"block_number", "token_ids"}) up to
+    block `head` (None if the head could not be read).
+
+    Replays Transfer logs since the stored block when the gap is at most
+    max_scan_blocks; otherwise, or if the scan raises, falls back to a full
+    crawl. If the crawl raises InventoryError, the stored set is reused.
+    With no stored set and no successful crawl, InventoryError is raised,
+    so callers never treat a partial or empty inventory as the truth.
+
+    Returns (token_ids, block to persist them at, or None if unchanged).
+    """
+    if head is None:
+        if state is None:
+            raise InventoryError("Could not read block number and no stored inventory")
+        print("[tokenworks] Block number unavailable, using stored inventory")
+        return state["token_ids"], None
+
+    if state is not None and state["block_number"] >= head:
+        return state["token_ids"], None
+
+    if state is not None and head - state["block_number"] <= max_scan_blocks:
+        try:
+            transfers = scan_transfers(state["block_number"] + 1, head)
+        except Exception as e:
+            print(f"[tokenworks] Transfer log scan failed, falling back to crawl: {e}")
+        else:
+            print(
+                f"[tokenworks] Applied {len(transfers)} transfers "
+                f"(blocks {state['block_number'] + 1}-{head})"
+            )
+            return apply_transfers(state["token_ids"], transfers), head
+
+    # Full crawl, recorded at the pre-crawl head: replaying transfers the
+    # crawl already reflects is harmless, missing some is not.
+    try:
+        token_ids = crawl()
+    except InventoryError as e:
+        if state is None:
+            raise
+        print(f"[tokenworks] {e}; using inventory from block {state['block_number']}")
+        return state["token_ids"], None
+
+    print(f"[tokenworks] Crawled inventory: {len(token_ids)} tokens")
+    return token_ids, head
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import signal
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from dotenv import load_dotenv
+
+from src.refresh_schedule import parse_timestamp, same_price
+
+load_dotenv()
+
+# Watch mode: seconds between sync cycles, health endpoint port, and how many
+# cycles to run before re-reading state from Supabase (picks up metadata
+# written by other jobs, e.g. `checks` tiers).
+WATCH_INTERVAL_SECONDS = int(os.getenv("WATCH_INTERVAL_SECONDS", "60"))
+WATCH_HEALTH_PORT = int(os.getenv("WATCH_HEALTH_PORT", "8080"))
+WATCH_HEALTH_HOST = os.getenv("WATCH_HEALTH_HOST", "127.0.0.1")
+WATCH_RELOAD_CYCLES = int(os.getenv("WATCH_RELOAD_CYCLES", "60"))
+
+# Per-sync state, keyed by sync name then token_id
+States = Dict[str, Dict[str, Dict[str, Any]]]
+State = Optional[Dict[str, Dict[str, Any]]]
+
+
+class PartialCycleError(RuntimeError):
+    """Some syncs in a cycle failed; the others completed normally."""
+
+
+# --------------------------------------------
+# Sync cycle
+# --------------------------------------------
+def run_syncs(
+    syncs: Sequence[Tuple[str, Callable[[State], Dict[str, Dict[str, Any]]]]],
+    states: States,
+    skip_errors: Tuple[Type[Exception], ...] = (),
+    stop: threading.Event | None = None,
+) -> bool:
+    """
+    Run each (name, sync) in order, passing its cached state and storing
+    the state it returns. A sync raising one of `skip_errors` is skipped,
+    and its state is dropped so it reloads next time. The remaining syncs
+    still run, then PartialCycleError names the failed ones.
+
+    If `stop` is set, no further syncs are started. Returns False if the
+    cycle was cut short that way, True if every sync ran.
+    """
+    failed: List[str] = []
+    completed = True
+
+    for name, sync in syncs:
+        if stop is not None and stop.is_set():
+            print(f"[watch] Stopping before {name} sync")
+            completed = False
+            break
+        try:
+            states[name] = sync(states.get(name))
+        except skip_errors as e:
+            print(f"[{name}] Skipped: {e}")
+            states.pop(name, None)
+            failed.append(name)
+
+    if failed:
+        raise PartialCycleError(f"Syncs failed: {', '.join(failed)}")
+    return completed
+
+
+# --------------------------------------------
+# Delta writes
+# --------------------------------------------
+def changed_rows(
+    data: List[Dict[str, Any]], existing: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Rows that are new or differ from their existing row in any synced
+    column (prices compared to the gwei). Used to write only deltas.
+    """
+    changed: List[Dict[str, Any]] = []
+
+    for row in data:
+        prev = existing.get(row["token_id"])
+        if prev is None:
+            changed.append(row)
+            continue
+        for key in ("price_eth", "highest_offer_eth", "owner", "next_refresh_at"):
+            old, new = prev.get(key), row.get(key)
+            if old is None or new is None:
+                same = old is new
+            elif key.endswith("_eth"):
+                same = same_price(old, new)
+            elif key.endswith("_at"):
+                same = parse_timestamp(old) == parse_timestamp(new)
+            else:
+                same = old == new
+            if not same:
+                changed.append(row)
+                break
+
+    return changed
+
+
+# --------------------------------------------
+# Health endpoint
+# --------------------------------------------
+def start_health_server(
+    port: int, health: Dict[str, Any], interval: int, host: str = WATCH_HEALTH_HOST
+) -> ThreadingHTTPServer:
+    """
+    Serve GET /health in a background thread, on localhost unless `host`
+    says otherwise. Responds 200 while the last successful cycle is recent
+    (within three intervals), 503 otherwise.
+    """
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/health":
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            last_ok = health.get("last_success_monotonic")
+            healthy = last_ok is not None and time.monotonic() - last_ok <= 3 * interval
+            body = {k: v for k, v in health.items() if k != "last_success_monotonic"}
+            body["status"] = "ok" if healthy else "unhealthy"
+
+            self.send_response(200 if healthy else 503)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode("utf-8"))
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[watch] Health endpoint on {host}:{port}/health")
+    return server
+
+
+# --------------------------------------------
+# Watch loop
+# --------------------------------------------
+def run_watch(
+    run_cycle: Callable[[States, threading.Event], None],
+    interval: int = WATCH_INTERVAL_SECONDS,
+    health_port: int | None = WATCH_HEALTH_PORT,
+    reload_cycles: int = WATCH_RELOAD_CYCLES,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Run `run_cycle(states, stop)` every `interval` seconds until SIGINT/SIGTERM
+    (or until `stop` is set); run_cycle should check `stop` between syncs so
+    shutdown does not wait for a whole cycle. Listing/offer state is kept in memory between
+    cycles so each cycle only fetches from OpenSea/Alchemy and writes
+    deltas; state is re-read from Supabase every `reload_cycles` cycles and
+    after a failed cycle. A PartialCycleError marks the cycle unhealthy but
+    keeps the state of the syncs that succeeded.
+    """
+    stop = stop or threading.Event()
+
+    def handle_signal(signum, frame):
+        print(f"\n[watch] Received signal {signum}, finishing current sync...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    health: Dict[str, Any] = {
+        "cycles": 0,
+        "last_cycle_at": None,
+        "last_cycle_seconds": None,
+        "last_error_type": None,
+        "last_success_monotonic": None,
+    }
+    server = start_health_server(health_port, health, interval) if health_port else None
+
+    states: States = {}
+    cycle = 0
+
+    while not stop.is_set():
+        if reload_cycles > 0 and cycle % reload_cycles == 0:
+            states.clear()
+
+        started = time.monotonic()
+        try:
+            run_cycle(states, stop)
+            health["last_success_monotonic"] = time.monotonic()
+            health["last_error_type"] = None
+        except PartialCycleError as e:
+            # Failed syncs already dropped their state; keep the rest
+            print(f"[watch] Sync cycle incomplete: {e}")
+            health["last_error_type"] = type(e).__name__
+        except Exception as e:
+            # Only the exception type is exposed on /health; details go to the log
+            print(f"[watch] Sync cycle failed: {e}")
+            health["last_error_type"] = type(e).__name__
+            states.clear()
+
+        elapsed = time.monotonic() - started
+        cycle += 1
+        health["cycles"] = cycle
+        health["last_cycle_at"] = datetime.now(timezone.utc).isoformat()
+        health["last_cycle_seconds"] = round(elapsed, 2)
+        print(f"[watch] Cycle {cycle} finished in {elapsed:.1f}s")
+
+        stop.wait(max(0.0, interval - elapsed))
+
+    if server:
+        server.shutdown()
+    print("[watch] Stopped")
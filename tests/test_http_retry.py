@@ -0,0 +1,56 @@
+import pytest
+import requests
+
+from src.http_retry import get_with_retries
+
+
+def response(status, headers=None):
+    res = requests.Response()
+    res.status_code = status
+    res.headers.update(headers or {})
+    return res
+
+
+def fake_get(*outcomes):
+    calls = []
+
+    def get(url, **kwargs):
+        calls.append(kwargs)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return get, calls
+
+
+def test_retries_rate_limits_and_server_errors():
+    sleeps = []
+    get, calls = fake_get(
+        response(429, {"Retry-After": "7"}),
+        response(503),
+        requests.ConnectionError("reset"),
+        response(200),
+    )
+
+    res = get_with_retries(get, "u", retries=3, sleep=sleeps.append, timeout=5)
+
+    assert res.status_code == 200
+    assert sleeps == [7, 2, 4]
+    assert calls[0] == {"timeout": 5}
+
+
+def test_gives_up_after_retries():
+    get, calls = fake_get(*[response(429)] * 3)
+
+    with pytest.raises(requests.HTTPError):
+        get_with_retries(get, "u", retries=2, sleep=lambda s: None)
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    get, calls = fake_get(response(404), response(200))
+
+    with pytest.raises(requests.HTTPError):
+        get_with_retries(get, "u", sleep=lambda s: None)
+    assert len(calls) == 1
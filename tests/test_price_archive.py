@@ -0,0 +1,109 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src import price_archive
+from src.price_archive import (
+    COLUMNS,
+    append_run,
+    eth_to_gwei,
+    floor_per_tier,
+    load_index,
+    scan,
+    token_price_path,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def hours(n):
+    return T0 + timedelta(hours=n)
+
+
+def test_eth_to_gwei():
+    assert eth_to_gwei("1.5") == 1_500_000_000
+    assert eth_to_gwei("30.123456789") == 30_123_456_789
+    assert eth_to_gwei(None) == 0
+
+
+def test_append_and_scan_range(tmp_path):
+    for k in range(3):
+        append_run("t", [{"token_id": "1", "price_eth": str(k + 1)}], hours(k), "opensea", root=tmp_path)
+
+    everything = list(scan("t", root=tmp_path))
+    assert sum(len(cols["run_ts"]) for cols in everything) == 3
+
+    middle = list(scan("t", start=hours(1), end=hours(2), root=tmp_path))
+    assert len(middle) == 1
+    assert isinstance(middle[0]["price_gwei"], np.memmap)
+    assert middle[0]["price_gwei"].tolist() == [2_000_000_000]
+
+
+def test_segments_roll_over_and_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_archive, "SEGMENT_MAX_ROWS", 2)
+    rows = [{"token_id": "1", "price_eth": "1"}, {"token_id": "2", "price_eth": "2"}]
+    for k in range(3):
+        append_run("t", rows, hours(k), root=tmp_path)
+
+    segments = load_index(os.path.join(tmp_path, "t"))["segments"]
+    assert [s["rows"] for s in segments] == [2, 2, 2]
+    assert len(list(scan("t", start=hours(2), root=tmp_path))) == 1
+
+
+def test_torn_append_is_truncated(tmp_path):
+    append_run("t", [{"token_id": "1", "price_eth": "1"}], hours(0), root=tmp_path)
+
+    # Simulate a crash after column bytes were written but before the index
+    seg_path = os.path.join(tmp_path, "t", "000000")
+    for col in COLUMNS:
+        with open(os.path.join(seg_path, f"{col}.bin"), "ab") as f:
+            f.write(b"\xff" * 5)
+
+    append_run("t", [{"token_id": "2", "price_eth": "2"}], hours(1), root=tmp_path)
+
+    for col, dtype in COLUMNS.items():
+        size = os.path.getsize(os.path.join(seg_path, f"{col}.bin"))
+        assert size == 2 * dtype.itemsize
+    path = token_price_path("t", 2, root=tmp_path)
+    assert path["price_gwei"].tolist() == [2_000_000_000]
+
+
+def test_token_price_path(tmp_path):
+    for k, price in enumerate(["1.0", "0.9", "1.2"]):
+        rows = [
+            {"token_id": "7", "price_eth": price, "highest_offer_eth": "0.5"},
+            {"token_id": "8", "price_eth": "3"},
+        ]
+        append_run("t", rows, hours(k), "opensea", root=tmp_path)
+
+    path = token_price_path("t", "7", root=tmp_path)
+
+    assert path["run_ts"].tolist() == [int(hours(k).timestamp()) for k in range(3)]
+    assert path["price_gwei"].tolist() == [1_000_000_000, 900_000_000, 1_200_000_000]
+    assert path["offer_gwei"].tolist() == [500_000_000] * 3
+
+
+def test_floor_per_tier_combines_sources_in_a_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_archive, "SEGMENT_MAX_ROWS", 1)
+    tiers = {"1": 80, "2": 80, "3": 40}
+    for k in range(2):
+        append_run("t", [{"token_id": "1", "price_eth": "0.7"}, {"token_id": "3", "price_eth": "2"}],
+                   hours(k), "opensea", tiers, root=tmp_path)
+        append_run("t", [{"token_id": "2", "price_eth": "0.5"}], hours(k), "tokenworks", tiers, root=tmp_path)
+
+    floors = floor_per_tier("t", root=tmp_path)
+    ts, floor80 = floors[80]
+    assert ts.tolist() == [int(hours(0).timestamp()), int(hours(1).timestamp())]
+    assert floor80.tolist() == [500_000_000, 500_000_000]
+    assert floors[40][1].tolist() == [2_000_000_000] * 2
+
+    opensea = floor_per_tier("t", source="opensea", root=tmp_path)
+    assert opensea[80][1].tolist() == [700_000_000, 700_000_000]
+
+
+def test_archive_dir_required(monkeypatch):
+    monkeypatch.setattr(price_archive, "PRICE_ARCHIVE_DIR", None)
+    with pytest.raises(ValueError):
+        append_run("t", [{"token_id": "1", "price_eth": "1"}], T0)
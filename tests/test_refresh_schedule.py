@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from src.refresh_schedule import (
+    REFRESH_COLD_INTERVAL,
+    REFRESH_HOT_INTERVAL,
+    compute_tier_floors,
+    next_refresh_at,
+    parse_timestamp,
+    plan_inventory_lookups,
+    plan_refreshes,
+    same_price,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def listing(token_id, price):
+    return {"token_id": token_id, "price_eth": price}
+
+
+def stored(price, next_at, checks=80):
+    return {"price_eth": price, "next_refresh_at": next_at.isoformat(), "checks": checks}
+
+
+def planned_ids(planned):
+    return [row["token_id"] for row, _ in planned]
+
+
+def test_parse_timestamp_handles_z_naive_and_garbage():
+    assert parse_timestamp("2026-01-01T00:00:00Z") == NOW
+    assert parse_timestamp("2026-01-01T00:00:00") == NOW
+    assert parse_timestamp("not a date") is None
+    assert parse_timestamp(None) is None
+
+
+def test_same_price_ignores_float_noise_below_a_gwei():
+    assert same_price(float("0.123456789012345678"), "0.123456789012345678")
+    assert same_price("1", 1.0)
+    assert not same_price("1.000000001", "1")
+
+
+def test_float_round_trip_is_not_repriced():
+    listings = [listing("1", "0.123456789012345678")]
+    existing = {"1": stored(float("0.123456789012345678"), NOW + timedelta(hours=1))}
+
+    assert plan_refreshes(listings, existing, NOW, 10, "checks") == []
+
+
+def test_tier_floors_group_by_stored_tier():
+    listings = [listing("1", "1.0"), listing("2", "0.4"), listing("3", "2.0"), listing("9", "0.1")]
+    existing = {"1": {"checks": 80}, "2": {"checks": 40}, "3": {"checks": 80}}
+
+    floors = compute_tier_floors(listings, existing, "checks")
+
+    assert floors == {80: Decimal("1.0"), 40: Decimal("0.4"), None: Decimal("0.1")}
+
+
+def test_not_due_rows_are_skipped():
+    listings = [listing("1", "1.0")]
+    existing = {"1": stored("1.0", NOW + timedelta(hours=1))}
+
+    assert plan_refreshes(listings, existing, NOW, 10, "checks") == []
+
+
+def test_new_and_repriced_rows_beat_overdue_rows():
+    listings = [
+        listing("overdue", "1.0"),
+        listing("repriced", "9.0"),
+        listing("new", "1.1"),
+    ]
+    existing = {
+        "overdue": stored("1.0", NOW - timedelta(days=3)),
+        # Cold row scheduled far in the future, but its price changed
+        "repriced": stored("10.0", NOW + REFRESH_COLD_INTERVAL),
+    }
+
+    planned = plan_refreshes(listings, existing, NOW, 2, "checks")
+
+    assert sorted(planned_ids(planned)) == ["new", "repriced"]
+
+
+def test_hot_rows_precede_cold_rows_within_a_group():
+    listings = [listing("cold", "5.0"), listing("hot", "1.0")]
+    existing = {
+        "cold": stored("5.0", NOW - timedelta(days=2)),
+        "hot": stored("1.0", NOW - timedelta(hours=1)),
+    }
+
+    planned = plan_refreshes(listings, existing, NOW, 10, "checks")
+
+    assert planned == [(listings[1], True), (listings[0], False)]
+
+
+def test_budget_caps_lookups_and_always_hot():
+    listings = [listing(str(i), "5.0") for i in range(5)]
+    listings.append(listing("floor", "1.0"))
+
+    planned = plan_refreshes(listings, {}, NOW, 3, always_hot=True)
+
+    assert len(planned) == 3
+    assert all(hot for _, hot in planned)
+    assert plan_refreshes(listings, {}, NOW, 0) == []
+
+
+def test_next_refresh_at_uses_tier_interval():
+    assert parse_timestamp(next_refresh_at(NOW, True)) == NOW + REFRESH_HOT_INTERVAL
+    assert parse_timestamp(next_refresh_at(NOW, False)) == NOW + REFRESH_COLD_INTERVAL
+
+
+def test_unlisted_tokens_wait_for_their_own_check_time():
+    past, future = NOW - timedelta(minutes=1), NOW + timedelta(hours=1)
+    existing = {"1": stored("0.5", past)}
+    unlisted = {"2": past.isoformat(), "3": future.isoformat()}
+
+    lookups = plan_inventory_lookups(["1", "2", "3", "4"], existing, unlisted, NOW, 10)
+
+    # "4" was never seen, so it goes first; "3" is not due yet
+    assert lookups[0] == "4"
+    assert sorted(lookups[1:]) == ["1", "2"]
+
+
+def test_unlisted_tokens_do_not_starve_listed_refreshes():
+    due = NOW - timedelta(minutes=1)
+    unlisted = {str(t): (NOW + timedelta(hours=24)).isoformat() for t in range(100, 110)}
+    existing = {"1": stored("0.5", due)}
+    token_ids = ["1", *unlisted]
+
+    assert plan_inventory_lookups(token_ids, existing, unlisted, NOW, 2) == ["1"]
+
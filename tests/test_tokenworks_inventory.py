@@ -0,0 +1,130 @@
+import pytest
+
+from src.tokenworks_inventory import (
+    InventoryError,
+    address_topic,
+    apply_transfers,
+    decode_transfer_logs,
+    resolve_holding_set,
+)
+
+TOKENWORKS = "0x" + "ab" * 20
+OTHER = "0x" + "01" * 20
+
+
+def topic(address):
+    return bytes.fromhex(address_topic(address)[2:])
+
+
+def transfer_log(block, log_index, sender, recipient, token_id):
+    return {
+        "blockNumber": block,
+        "logIndex": log_index,
+        "topics": [b"T", topic(sender), topic(recipient), token_id.to_bytes(32, "big")],
+    }
+
+
+def transfer(block, token_id, incoming):
+    return {"block": block, "log_index": 0, "token_id": token_id, "incoming": incoming}
+
+
+def failing(exc):
+    def fn(*args):
+        raise exc
+    return fn
+
+
+def test_address_topic_pads_to_32_bytes():
+    assert address_topic("0xABCD") == "0x" + "0" * 60 + "abcd"
+
+
+def test_decode_orders_logs_and_dedupes_self_transfers():
+    self_transfer = transfer_log(5, 2, TOKENWORKS, TOKENWORKS, 9)
+    logs = [
+        transfer_log(7, 0, TOKENWORKS, OTHER, 1),
+        self_transfer,
+        transfer_log(5, 1, OTHER, TOKENWORKS, 1),
+        self_transfer,  # returned by both the "from" and "to" filters
+    ]
+
+    transfers = decode_transfer_logs(logs, TOKENWORKS)
+
+    assert [(t["block"], t["log_index"]) for t in transfers] == [(5, 1), (5, 2), (7, 0)]
+    assert [(t["token_id"], t["incoming"]) for t in transfers] == [
+        ("1", True),
+        ("9", True),
+        ("1", False),
+    ]
+
+
+def test_apply_transfers_in_order():
+    transfers = [
+        transfer(1, "5", True),
+        transfer(2, "2", False),
+        transfer(3, "5", False),
+        transfer(4, "5", True),
+    ]
+
+    assert apply_transfers(["2", "10"], transfers) == ["5", "10"]
+
+
+def test_scan_updates_stored_set():
+    state = {"block_number": 100, "token_ids": ["1", "2"]}
+    calls = []
+
+    def scan(start, end):
+        calls.append((start, end))
+        return [transfer(150, "2", False), transfer(160, "3", True)]
+
+    token_ids, block = resolve_holding_set(state, 200, scan, failing(AssertionError), 1000)
+
+    assert calls == [(101, 200)]
+    assert (token_ids, block) == (["1", "3"], 200)
+
+
+def test_up_to_date_state_is_reused_without_saving():
+    state = {"block_number": 200, "token_ids": ["1"]}
+
+    result = resolve_holding_set(state, 200, failing(AssertionError), failing(AssertionError), 1000)
+
+    assert result == (["1"], None)
+
+
+def test_failed_scan_falls_back_to_crawl():
+    state = {"block_number": 100, "token_ids": ["1", "2"]}
+
+    result = resolve_holding_set(state, 200, failing(IOError("rate limited")), lambda: ["7"], 1000)
+
+    assert result == (["7"], 200)
+
+
+def test_large_gap_crawls_instead_of_scanning():
+    state = {"block_number": 100, "token_ids": ["1"]}
+
+    result = resolve_holding_set(state, 5000, failing(AssertionError), lambda: ["4"], 1000)
+
+    assert result == (["4"], 5000)
+
+
+def test_failed_crawl_keeps_stored_set():
+    state = {"block_number": 100, "token_ids": ["1", "2"]}
+
+    result = resolve_holding_set(
+        state, 200, failing(IOError("boom")), failing(InventoryError("getNFTs crawl failed")), 1000
+    )
+
+    # The stored set is returned and not re-saved at the new head
+    assert result == (["1", "2"], None)
+
+
+def test_no_state_and_failed_crawl_raises():
+    with pytest.raises(InventoryError):
+        resolve_holding_set(None, 200, failing(AssertionError), failing(InventoryError("down")), 1000)
+
+
+def test_unknown_head_uses_stored_set_or_raises():
+    state = {"block_number": 100, "token_ids": ["1"]}
+
+    assert resolve_holding_set(state, None, failing(AssertionError), failing(AssertionError), 1000) == (["1"], None)
+    with pytest.raises(InventoryError):
+        resolve_holding_set(None, None, failing(AssertionError), failing(AssertionError), 1000)
@@ -0,0 +1,208 @@
+import threading
+
+import pytest
+
+from src import watch
+from src.watch import PartialCycleError, changed_rows, run_syncs, run_watch
+
+
+def row(token_id="1", **fields):
+    base = {
+        "token_id": token_id,
+        "price_eth": "1.5",
+        "highest_offer_eth": None,
+        "owner": "0xabc",
+        "next_refresh_at": "2026-01-01T01:00:00+00:00",
+    }
+    return {**base, **fields}
+
+
+def test_new_rows_are_changed():
+    assert changed_rows([row()], {}) == [row()]
+
+
+def test_identical_rows_are_skipped():
+    assert changed_rows([row(last_seen_at="later")], {"1": row()}) == []
+
+
+def test_prices_compare_to_the_gwei():
+    existing = {"1": row(price_eth=1.5, highest_offer_eth=float("0.123456789012345678"))}
+    data = [row(highest_offer_eth="0.123456789012345678")]
+
+    assert changed_rows(data, existing) == []
+    assert changed_rows([row(price_eth="1.500000001")], existing) != []
+
+
+def test_none_and_value_differ():
+    assert changed_rows([row(highest_offer_eth="0.5")], {"1": row()}) != []
+    assert changed_rows([row()], {"1": row(highest_offer_eth="0.5")}) != []
+
+
+def test_timestamps_compare_as_instants():
+    existing = {"1": row(next_refresh_at="2026-01-01T01:00:00Z")}
+
+    assert changed_rows([row()], existing) == []
+    assert changed_rows([row(next_refresh_at="2026-01-01T02:00:00+00:00")], existing) != []
+
+
+def test_owner_change_is_written():
+    assert changed_rows([row(owner="0xdef")], {"1": row()}) != []
+
+
+@pytest.fixture
+def no_signals(monkeypatch):
+    monkeypatch.setattr(watch.signal, "signal", lambda *args: None)
+
+
+def test_run_watch_keeps_state_and_resets_after_failure(no_signals):
+    stop = threading.Event()
+    seen = []
+
+    def run_cycle(states, stop_event):
+        seen.append(dict(states))
+        n = len(seen)
+        if n == 3:
+            states["opensea"] = {"x": {}}
+            raise RuntimeError("boom")
+        states["opensea"] = {str(n): {}}
+        if n == 5:
+            stop.set()
+
+    run_watch(run_cycle, interval=0, health_port=None, reload_cycles=0, stop=stop)
+
+    assert seen == [
+        {},
+        {"opensea": {"1": {}}},
+        {"opensea": {"2": {}}},
+        {},  # cleared after the failed cycle
+        {"opensea": {"4": {}}},
+    ]
+
+
+def test_run_watch_reloads_every_n_cycles(no_signals):
+    stop = threading.Event()
+    seen = []
+
+    def run_cycle(states, stop_event):
+        seen.append(bool(states))
+        states["editions"] = {}
+        if len(seen) == 5:
+            stop.set()
+
+    run_watch(run_cycle, interval=0, health_port=None, reload_cycles=2, stop=stop)
+
+    assert seen == [False, True, False, True, False]
+
+
+class CrawlError(RuntimeError):
+    pass
+
+
+def test_run_syncs_skips_failed_sync_and_runs_the_rest():
+    states = {"opensea": {"old": {}}, "tokenworks": {"t": {}}}
+    calls = []
+
+    def failing(existing):
+        calls.append("opensea")
+        raise CrawlError("429")
+
+    def tokenworks(existing):
+        calls.append("tokenworks")
+        assert existing == {"t": {}}
+        return {"t2": {}}
+
+    def editions(existing):
+        calls.append("editions")
+        return {"e": {}}
+
+    with pytest.raises(PartialCycleError, match="opensea"):
+        run_syncs(
+            [("opensea", failing), ("tokenworks", tokenworks), ("editions", editions)],
+            states,
+            skip_errors=(CrawlError,),
+        )
+
+    assert calls == ["opensea", "tokenworks", "editions"]
+    assert states == {"tokenworks": {"t2": {}}, "editions": {"e": {}}}
+
+
+def test_run_syncs_propagates_other_errors():
+    def broken(existing):
+        raise ValueError("bug")
+
+    with pytest.raises(ValueError):
+        run_syncs([("opensea", broken)], {}, skip_errors=(CrawlError,))
+
+
+def test_partial_cycle_keeps_other_states(no_signals):
+    stop = threading.Event()
+    seen = []
+
+    def run_cycle(states, stop_event):
+        seen.append(dict(states))
+        states["editions"] = {str(len(seen)): {}}
+        if len(seen) == 1:
+            raise PartialCycleError("opensea")
+        stop.set()
+
+    run_watch(run_cycle, interval=0, health_port=None, reload_cycles=0, stop=stop)
+
+    assert seen == [{}, {"editions": {"1": {}}}]
+
+
+def test_run_syncs_stops_between_syncs():
+    stop = threading.Event()
+    calls = []
+
+    def first(existing):
+        calls.append("first")
+        stop.set()  # e.g. SIGTERM arrives during the first sync
+        return {}
+
+    def second(existing):
+        calls.append("second")
+        return {}
+
+    completed = run_syncs([("first", first), ("second", second)], {}, stop=stop)
+
+    assert completed is False
+    assert calls == ["first"]
+
+
+def test_run_syncs_reports_completion():
+    assert run_syncs([("only", lambda existing: {})], {}) is True
+
+
+def test_run_watch_passes_stop_to_cycle(no_signals):
+    stop = threading.Event()
+    received = []
+
+    def run_cycle(states, stop_event):
+        received.append(stop_event)
+        stop_event.set()
+
+    run_watch(run_cycle, interval=0, health_port=None, stop=stop)
+
+    assert received == [stop]
+
+
+def test_health_endpoint_binds_localhost_and_hides_error_text():
+    import json
+    import urllib.error
+    import urllib.request
+
+    from src.watch import start_health_server
+
+    health = {"cycles": 1, "last_error_type": "ListingsError", "last_success_monotonic": None}
+    server = start_health_server(0, health, interval=60)
+    try:
+        host, port = server.server_address[:2]
+        assert host == "127.0.0.1"
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health")
+        body = json.loads(exc.value.read())
+    finally:
+        server.shutdown()
+
+    assert exc.value.code == 503
+    assert body == {"cycles": 1, "last_error_type": "ListingsError", "status": "unhealthy"}